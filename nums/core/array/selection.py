@@ -67,8 +67,8 @@ def is_advanced_selection(subscript: tuple):
 def pos_step_slice_to_range(n, start_bound, stop_bound):
     if n < 0:
         n += stop_bound - start_bound
-    n = np.clip(n, start_bound, stop_bound)
-    return n
+    # Clip with builtins: np.clip is much slower on Python scalars.
+    return min(max(n, start_bound), stop_bound)
 
 
 def neg_step_slice_to_range(n, start_bound, stop_bound):
@@ -79,8 +79,7 @@ def neg_step_slice_to_range(n, start_bound, stop_bound):
         n -= start_bound - stop_bound
     # Similar to positive steps,
     # any start, stop below the stop bounds is clipped for negative steps.
-    n = np.clip(n, stop_bound, start_bound)
-    return n
+    return min(max(n, stop_bound), start_bound)
 
 
 def trim_slice_bounds(s: slice, size: int):
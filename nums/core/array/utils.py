@@ -87,15 +87,28 @@ def broadcast_block_shape(a_shape, b_shape, a_block_shape):
 
 
 def broadcast_shape(a_shape, b_shape):
-    return broadcast(a_shape, b_shape).shape
+    # Compare right-aligned dims directly instead of constructing
+    # a numpy broadcast object.
+    # See: https://numpy.org/devdocs/user/theory.broadcasting.html
+    long_shape, short_shape = (a_shape, b_shape) if len(a_shape) >= len(b_shape) \
+        else (b_shape, a_shape)
+    num_leading = len(long_shape) - len(short_shape)
+    result_shape = list(long_shape[:num_leading])
+    for long_dim, short_dim in zip(long_shape[num_leading:], short_shape):
+        if long_dim == short_dim or short_dim == 1:
+            result_shape.append(long_dim)
+        elif long_dim == 1:
+            result_shape.append(short_dim)
+        else:
+            raise ValueError("Cannot broadcast %s with %s." % (str(a_shape), str(b_shape)))
+    return tuple(result_shape)
 
 
 def can_broadcast_shapes(a_shape, b_shape):
-    try:
-        assert broadcast_shape(a_shape, b_shape) is not None
-        return True
-    except ValueError as _:
-        return False
+    for a_dim, b_dim in zip(reversed(a_shape), reversed(b_shape)):
+        if a_dim != b_dim and a_dim != 1 and b_dim != 1:
+            return False
+    return True
 
 
 def broadcast_shape_to(from_shape, to_shape):
@@ -107,11 +120,12 @@ def broadcast_shape_to(from_shape, to_shape):
 
 def can_broadcast_shape_to(from_shape, to_shape):
     # See: https://numpy.org/devdocs/user/theory.broadcasting.html
-    try:
-        broadcast_shape_to(from_shape, to_shape)
-        return True
-    except ValueError as _:
+    if len(from_shape) > len(to_shape):
         return False
+    for from_dim, to_dim in zip(reversed(from_shape), reversed(to_shape)):
+        if from_dim != 1 and from_dim != to_dim:
+            return False
+    return True
 
 
 def broadcast_shape_to_alt(from_shape, to_shape):
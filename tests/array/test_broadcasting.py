@@ -20,7 +20,9 @@
 # DEALINGS IN THE SOFTWARE.
 
 
+import functools
 import itertools
+import operator
 
 import tqdm
 import numpy as np
@@ -29,77 +31,98 @@ import pytest
 from nums.core.array import utils as array_utils
 
 
+def get_effective_shapes(num_axes=5, max_dim=3):
+    # Axes set to 0 are dropped from the resulting shape, so tuples such as
+    # (0, 0, 1, 2, 3) and (0, 1, 0, 2, 3) define the same array shape (1, 2, 3).
+    # Enumerate each distinct shape once.
+    return sorted(set(tuple(filter(lambda x: x > 0, shape))
+                      for shape in itertools.product(range(max_dim + 1), repeat=num_axes)))
+
+
+@functools.lru_cache(maxsize=None)
+def get_array(shape):
+    # The tests only depend on array shapes, not their contents,
+    # so return a read-only view of a scalar with 0 strides along each axis.
+    return np.broadcast_to(np.float64(0.0), shape)
+
+
+def assert_all_raise(error_type, *calls):
+    for func, args in calls:
+        try:
+            func(*args)
+        except error_type:
+            continue
+        # Report arrays by shape, since only shapes matter in these tests.
+        args_str = ", ".join("array%s" % str(arg.shape) if isinstance(arg, np.ndarray)
+                             else str(arg) for arg in args)
+        pytest.fail("%s(%s) did not raise %s" % (func.__name__, args_str, error_type.__name__))
+
+
 def test_assign_broadcasting():
     # https://numpy.org/doc/stable/user/basics.indexing.html#assigning-values-to-indexed-arrays
     # Note that the above documentation does not fully capture the broadcasting behavior of NumPy.
     # We therefore test our tools for broadcasting with array shapes, instead of arrays.
-    # Consider the permutations of a tuple of 10 integers ranging from 0 to 3.
-    # We partition this tuple into 2 tuples of 5 integers, and
-    # use the tuples to define the shapes of two arrays,
-    # to define the LHS and RHS of an assignment.
-    # A value of 0 means the axis is not specified in the resulting array shape.
-    # Because we're interested in valid assignment operations,
-    # we define empty arrays of size equal to the product of
-    # axis dims, excluding any axes which are set to 0.
-    # If all axes are set to 0,
-    # then create a dimensionless array with value 0.
+    # Consider tuples of 5 integers ranging from 0 to 3.
+    # A value of 0 means the axis is not specified in the resulting array shape,
+    # so each tuple defines a shape with at most 5 axes, and a tuple of all 0s
+    # defines the dimensionless shape ().
+    # Tuples which differ only in the placement of 0s define the same shape,
+    # so we iterate over all ordered pairs of distinct shapes (see get_effective_shapes),
+    # which define the shapes of the LHS and RHS of an assignment.
+    # Only shapes matter, so get_array returns read-only views of a scalar
+    # with 0 strides, which carry a shape without allocating a data buffer.
+    # The assignment itself writes through a view of scratch with the LHS shape.
     # There is no formal proof that the proof for arrays with 5 axes
     # is without loss of generality.
-    def get_array(shape):
-        shape = tuple(filter(lambda x: x > 0, shape))
-        if len(shape) == 0:
-            return np.array(0)
-        else:
-            return np.empty(np.product(shape)).reshape(shape)
-
-    perms = list(itertools.product([0, 1, 2, 3], repeat=10))
-    pbar = tqdm.tqdm(total=len(perms))
-    for shapes in perms:
-        A: np.ndarray = get_array(shapes[:5])
-        B: np.ndarray = get_array(shapes[5:])
-        try:
-            if A.shape == ():
-                continue
-            if B.shape == ():
-                A[:] = B
+    shapes = get_effective_shapes()
+    # Views of get_array are read-only, so LHS arrays are viewed from a writable buffer.
+    scratch = np.empty(max(functools.reduce(operator.mul, shape, 1) for shape in shapes))
+    # Progress is reported once per LHS shape to keep tqdm out of the inner loop.
+    pbar = tqdm.tqdm(total=len(shapes)**2, disable=None)
+    for A_shape in shapes:
+        A: np.ndarray = get_array(A_shape)
+        if A.shape == ():
+            pbar.update(len(shapes))
+            continue
+        for B_shape in shapes:
+            B: np.ndarray = get_array(B_shape)
+            if array_utils.can_broadcast_shape_to(B.shape, A.shape):
+                # This should execute without error.
+                scratch[:A.size].reshape(A.shape)[:] = B
+                assert np.broadcast_to(B, A.shape).shape == \
+                    array_utils.broadcast_shape_to_alt(B.shape, A.shape)
             else:
-                A[:] = B[:]
-            # This should execute without error.
-            assert np.broadcast_to(B, A.shape).shape == array_utils.broadcast_shape_to_alt(B.shape,
-                                                                                           A.shape)
-            assert array_utils.can_broadcast_shape_to(B.shape, A.shape), \
-                "%s can be broadcast to %s" % (B.shape, A.shape)
-        except ValueError as _:
-            with pytest.raises(ValueError):
-                np.broadcast_to(B, A.shape)
-            with pytest.raises(ValueError):
-                array_utils.broadcast_shape_to_alt(B.shape, A.shape)
-            assert not array_utils.can_broadcast_shape_to(B.shape, A.shape), \
-                "%s cannot be broadcast to %s" % (B.shape, A.shape)
-        pbar.update(1)
+                # NumPy assignment also strips leading unit axes from B,
+                # so only broadcast_to semantics are expected to fail here.
+                assert_all_raise(ValueError,
+                                 (np.broadcast_to, (B, A.shape)),
+                                 (array_utils.broadcast_shape_to_alt, (B.shape, A.shape)))
+        pbar.update(len(shapes))
 
 
 def test_bop_broadcasting():
-    def get_array(shape):
-        shape = tuple(filter(lambda x: x > 0, shape))
-        if len(shape) == 0:
-            return np.array(0)
-        else:
-            return np.empty(np.product(shape)).reshape(shape)
-
-    perms = list(itertools.product([0, 1, 2, 3], repeat=10))
-    pbar = tqdm.tqdm(total=len(perms))
-    for shapes in perms:
-        A: np.ndarray = get_array(shapes[:5])
-        B: np.ndarray = get_array(shapes[5:])
-        try:
-            assert (A * B).shape == array_utils.broadcast_shape(A.shape, B.shape)
-        except ValueError as _:
-            assert not array_utils.can_broadcast_shapes(B.shape, A.shape)
-            assert not array_utils.can_broadcast_shapes(A.shape, B.shape)
-            with pytest.raises(ValueError):
-                array_utils.broadcast_shape(A.shape, B.shape)
-        pbar.update(1)
+    # NumPy broadcasting is symmetric in its operands,
+    # so each unordered pair of shapes is tested once,
+    # and array_utils is checked with both argument orders.
+    shapes = get_effective_shapes()
+    pbar = tqdm.tqdm(total=len(shapes) * (len(shapes) + 1) // 2, disable=None)
+    for i, A_shape in enumerate(shapes):
+        A: np.ndarray = get_array(A_shape)
+        for B_shape in shapes[i:]:
+            B: np.ndarray = get_array(B_shape)
+            if array_utils.can_broadcast_shapes(A.shape, B.shape):
+                assert array_utils.can_broadcast_shapes(B.shape, A.shape)
+                # np.broadcast computes the output shape of A * B without evaluating it.
+                expected_shape = np.broadcast(A, B).shape
+                assert expected_shape == array_utils.broadcast_shape(A.shape, B.shape)
+                assert expected_shape == array_utils.broadcast_shape(B.shape, A.shape)
+            else:
+                assert not array_utils.can_broadcast_shapes(B.shape, A.shape)
+                assert_all_raise(ValueError,
+                                 (np.broadcast, (A, B)),
+                                 (array_utils.broadcast_shape, (A.shape, B.shape)),
+                                 (array_utils.broadcast_shape, (B.shape, A.shape)))
+        pbar.update(len(shapes) - i)
 
 
 if __name__ == "__main__":
@@ -33,12 +33,19 @@ from nums.core.array.application import ArrayApplication
 
 
 def get_slices(size, index_multiplier=1, limit=None, basic_step=False):
-    index_multiplier = [None] + list(range(-size * index_multiplier, size * index_multiplier + 1))
-    items = list()
-    for start, stop, step in itertools.product(index_multiplier, repeat=3):
-        if step == 0 or (basic_step and step not in (None, 1)):
-            continue
-        items.append(slice(start, stop, step))
+    max_index = size * index_multiplier
+    index_params = [None] + list(range(-max_index, max_index + 1))
+    # Enumerate (start, stop, step) as positions into index_params,
+    # in the same order as itertools.product, and filter invalid steps with a mask.
+    positions = np.arange(len(index_params))
+    starts, stops, steps = map(np.ravel, np.meshgrid(positions, positions, positions,
+                                                     indexing="ij"))
+    none_pos, zero_pos, one_pos = 0, max_index + 1, max_index + 2
+    mask = steps != zero_pos
+    if basic_step:
+        mask &= (steps == none_pos) | (steps == one_pos)
+    items = [slice(index_params[start], index_params[stop], index_params[step])
+             for start, stop, step in zip(starts[mask], stops[mask], steps[mask])]
     if limit is None:
         return items
     else:
@@ -47,27 +54,33 @@ def get_slices(size, index_multiplier=1, limit=None, basic_step=False):
 
 def subsample(items, max_items, seed=1337):
     rs = np.random.RandomState(seed)
-    return np.array(items)[rs.choice(np.arange(len(items), dtype=int), max_items)].tolist()
+    indices = rs.choice(len(items), min(max_items, len(items)), replace=False)
+    return [items[i] for i in indices]
+
+
+def get_subscript_shape(shape, subscript):
+    # Output shape of a subscript of ints and slices under Python's slice semantics.
+    oshape = []
+    for dim, axis_ss in zip(shape, subscript):
+        if isinstance(axis_ss, slice):
+            oshape.append(len(range(*axis_ss.indices(dim))))
+    return tuple(oshape) + tuple(shape[len(subscript):])
 
 
 def is_broadcastable(lshape, laccessor, rshape, raccessor):
     lsel = sel_module.BasicSelection.from_subscript(lshape, laccessor)
     rsel = sel_module.BasicSelection.from_subscript(rshape, raccessor)
-    try:
-        array_utils.broadcast_shape_to(rsel.get_output_shape(),
-                                       lsel.get_output_shape())
-        return True
-    except ValueError as _:
-        return False
+    return array_utils.can_broadcast_shape_to(rsel.get_output_shape(),
+                                              lsel.get_output_shape())
 
 
 def test_basic_select(app_inst: ArrayApplication):
     arr: np.ndarray = np.arange(5)
     block_shape = 3,
     slice_params = list(get_slices(size=10, index_multiplier=2, basic_step=True))
-    pbar = tqdm.tqdm(total=len(slice_params))
+    pbar = tqdm.tqdm(total=len(slice_params), disable=None)
     for slice_sel in slice_params:
-        pbar.set_description(str(slice_sel))
+        pbar.set_description(str(slice_sel), refresh=False)
         pbar.update(1)
         ba = app_inst.array(arr, block_shape=block_shape)
         bav = ArrayView.from_block_array(ba)
@@ -79,9 +92,9 @@ def test_basic_assign(app_inst: ArrayApplication):
     from_arr: np.ndarray = np.arange(5)
     block_shape = 3,
     slice_params = list(get_slices(size=10, index_multiplier=2, basic_step=True))
-    pbar = tqdm.tqdm(total=len(slice_params))
+    pbar = tqdm.tqdm(total=len(slice_params), disable=None)
     for slice_sel in slice_params:
-        pbar.set_description(str(slice_sel))
+        pbar.set_description(str(slice_sel), refresh=False)
         pbar.update(1)
 
         from_ba = app_inst.array(from_arr, block_shape=block_shape)
@@ -146,43 +159,56 @@ def test_basic_assign_3axis(app_inst: ArrayApplication):
                                                                         limit=limit)
 
     mode_iterator = list(itertools.product(access_modes, repeat=num_axes))
-    pbar = tqdm.tqdm(total=(len(left_accessor_iterator) *
-                            len(right_accessor_iterator) *
-                            len(mode_iterator)**2))
-
-    def test_assignment(left_item, left_mode, right_item, right_mode):
-        lshape, lblock_shape, laccessor = left_item
-        laccessor = tuple(left_mode[i](*laccessor[i]) for i in range(num_axes))
-        rshape, rblock_shape, raccessor = right_item
-        raccessor = tuple(right_mode[i](*raccessor[i]) for i in range(num_axes))
-        if not is_broadcastable(lshape, laccessor, rshape, raccessor):
-            return False
-        npA = np.zeros(np.product(lshape)).reshape(*lshape)
-        npB = np.random.random_sample(np.product(rshape)).reshape(*rshape)
+
+    def expand_accessors(shape, accessor_iterator):
+        # Apply every combination of access modes to each accessor once, up front.
+        accessors = [tuple(mode[i](*accessor[i]) for i in range(num_axes))
+                     for accessor in accessor_iterator
+                     for mode in mode_iterator]
+        # Keep the output shapes in a separate array, right-aligned,
+        # with -1 marking axes which are indexed away.
+        oshapes = np.full((len(accessors), num_axes), -1, dtype=np.intp)
+        for i, accessor in enumerate(accessors):
+            oshape = get_subscript_shape(shape, accessor)
+            sel = sel_module.BasicSelection.from_subscript(shape, accessor)
+            sel_oshape = sel.get_output_shape()
+            assert tuple(sel_oshape) == oshape, "%s != %s" % (sel_oshape, oshape)
+            oshapes[i, num_axes - len(oshape):] = oshape
+        return accessors, oshapes
+
+    left_accessors, left_oshapes = expand_accessors(lshape, left_accessor_iterator)
+    right_accessors, right_oshapes = expand_accessors(rshape, right_accessor_iterator)
+
+    # Apply the rules of array_utils.can_broadcast_shape_to to all pairs at once.
+    lo = left_oshapes[:, np.newaxis, :]
+    ro = right_oshapes[np.newaxis, :, :]
+    feasible = np.all((ro == -1) | ((lo != -1) & ((ro == 1) | (ro == lo))), axis=-1)
+    feasible_pairs = np.argwhere(feasible)
+    pbar = tqdm.tqdm(total=len(feasible_pairs), disable=None)
+
+    # Assignment never modifies the RHS, so it is constructed once for all tests.
+    npB = np.random.RandomState(1337).random_sample(rshape)
+    baB = app_inst.array(npB, block_shape=rblock_shape)
+    bavB = ArrayView.from_block_array(baB)
+    # The LHS buffer is reset before each test instead of reallocated.
+    npA = np.empty(lshape)
+
+    def test_assignment(laccessor, raccessor):
+        npA.fill(0)
         baA = app_inst.array(npA, block_shape=lblock_shape)
-        baB = app_inst.array(npB, block_shape=rblock_shape)
         bavA = ArrayView.from_block_array(baA)
-        bavB = ArrayView.from_block_array(baB)
         assert np.allclose(npA[laccessor], bavA[laccessor].create().get())
         assert np.allclose(npB[raccessor], bavB[raccessor].create().get())
         npA[laccessor] = npB[raccessor]
         bavA[laccessor] = bavB[raccessor]
         assert np.allclose(npA, bavA.create().get())
         assert np.allclose(npB, bavB.create().get())
-        return True
-
-    num_valid = 0
-    for laccessor in left_accessor_iterator:
-        left_item = lshape, lblock_shape, laccessor
-        for raccessor in right_accessor_iterator:
-            right_item = rshape, rblock_shape, raccessor
-            for left_mode in mode_iterator:
-                for right_mode in mode_iterator:
-                    if test_assignment(left_item, left_mode,
-                                       right_item, right_mode):
-                        num_valid += 1
-                        pbar.set_description("num_valid=%d" % num_valid)
-                    pbar.update(1)
+
+    # Every pair here is broadcastable under BasicSelection's output shapes,
+    # since those were asserted to match when the accessors were expanded.
+    for i, j in feasible_pairs:
+        test_assignment(left_accessors[i], right_accessors[j])
+        pbar.update(1)
 
 
 if __name__ == "__main__":